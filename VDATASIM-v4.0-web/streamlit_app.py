@@ -1,10 +1,15 @@
 import streamlit as st
 import numpy as np
 import os
+import sys
 import struct
 from pathlib import Path
 import time
 
+# The drive index is shared with the desktop engine, one directory up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vdatasim_topology import DriveTopology
+
 # Set page config - MUST be first Streamlit command
 st.set_page_config(
     page_title="Erasure Coded Storage",
@@ -101,15 +106,19 @@ class ErasureCodedStorage:
         self.drives_per_dbox = 44
         
         self.drives = []
-        self.drive_status = [True] * self.total_drives
         self.drive_data_preview = ['00000000'] * self.total_drives
         self.storage_path = "./storage"
         
+        # Drives whose preview changed since the grid last took them
+        self.dirty_drives = set()
+        
         self.stored_file_data = None
         self.stored_file_name = None
         self.ha_mode = False
         
         self.dboxes = self._configure_dboxes()
+        self.topology = DriveTopology(self.dboxes, self.total_drives)
+        self.drive_status = self.topology.status
         
     def _configure_dboxes(self):
         dboxes = []
@@ -137,6 +146,7 @@ class ErasureCodedStorage:
                 'local_groups': local_groups,
                 'local_parity_drives': local_parity_drives,
                 'global_parity_drive': global_parity_drive,
+                'global_parity_drives': [global_parity_drive],
                 'spare_drives': spare_drives,
                 'all_drives': list(range(base_drive, base_drive + 44))
             })
@@ -144,20 +154,21 @@ class ErasureCodedStorage:
         return dboxes
     
     def get_drive_type(self, drive_id):
-        for dbox in self.dboxes:
-            if drive_id in dbox['data_drives']:
-                return "Data"
-            elif drive_id in dbox['local_parity_drives']:
-                return "Local Parity"
-            elif drive_id == dbox['global_parity_drive']:
-                return "Global Parity"
-            elif drive_id in dbox['spare_drives']:
-                return "Hot Spare"
-        return "Unknown"
+        return self.topology.role_name(drive_id)
     
     def get_dbox_for_drive(self, drive_id):
         return drive_id // self.drives_per_dbox
     
+    def _set_preview(self, drive_id, preview):
+        if preview != self.drive_data_preview[drive_id]:
+            self.drive_data_preview[drive_id] = preview
+            self.dirty_drives.add(drive_id)
+    
+    def pop_dirty_drives(self):
+        """Drives whose preview changed since the last call"""
+        dirty, self.dirty_drives = self.dirty_drives, set()
+        return dirty
+    
     def initialize_drives(self):
         """Initialize all drives with random data"""
         if not os.path.exists(self.storage_path):
@@ -170,7 +181,7 @@ class ErasureCodedStorage:
                 f.write(b'\x00' * 1024)
             self.drives.append(filepath)
             # Generate random hex preview
-            self.drive_data_preview[i] = ''.join([f'{np.random.randint(0, 256):02X}' for _ in range(4)])
+            self._set_preview(i, ''.join([f'{np.random.randint(0, 256):02X}' for _ in range(4)]))
         
         return True
     
@@ -207,34 +218,32 @@ class ErasureCodedStorage:
         for i in range(num_drives_used):
             if len(combined_data) > i * 4:
                 chunk = combined_data[i*4:(i+1)*4]
-                self.drive_data_preview[i] = ''.join([f'{b:02X}' for b in chunk[:4]])
+                self._set_preview(i, ''.join([f'{b:02X}' for b in chunk[:4]]))
         
         return True, f"Successfully stored {len(uploaded_files)} file(s)"
     
     def check_integrity(self):
         """Check if data is recoverable"""
-        offline_drives = [i for i, status in enumerate(self.drive_status) if not status]
+        offline_count = np.count_nonzero(~self.drive_status)
         
-        if len(offline_drives) == 0:
+        if offline_count == 0:
             return True, "✅ All drives online - Data fully protected", []
         
-        # Check each Dbox for failures
-        vulnerable_dboxes = []
-        for dbox in self.dboxes:
-            dbox_failures = [d for d in offline_drives if d in dbox['all_drives']]
-            if len(dbox_failures) > 3:
-                vulnerable_dboxes.append(dbox['id'])
+        # Same parity rule as the desktop engine's integrity check
+        vulnerable_dboxes = self.topology.lost_dboxes().tolist()
         
         if len(vulnerable_dboxes) > 0:
             return False, f"⚠️ Data at risk in Dboxes: {vulnerable_dboxes}", vulnerable_dboxes
         
-        return True, f"✅ Data recoverable ({len(offline_drives)} drives offline)", []
+        return True, f"✅ Data recoverable ({offline_count} drives offline)", []
 
 # Initialize session state
 if 'storage' not in st.session_state:
     st.session_state.storage = ErasureCodedStorage()
     st.session_state.initialized = False
     st.session_state.selected_dbox = 0
+    # Rendered drive boxes {drive_id: (online, html)}, redrawn when dirty or toggled
+    st.session_state.drive_html = {}
 
 storage = st.session_state.storage
 
@@ -420,13 +429,11 @@ else:
         if st.button("🔴 Toggle Entire Dbox", use_container_width=True):
             dbox = storage.dboxes[selected_dbox]
             new_status = not storage.drive_status[dbox['all_drives'][0]]
-            for drive_id in dbox['all_drives']:
-                storage.drive_status[drive_id] = new_status
+            storage.drive_status[storage.topology.dbox == selected_dbox] = new_status
             st.rerun()
     
     with col3:
-        offline_in_dbox = sum(1 for d in storage.dboxes[selected_dbox]['all_drives'] 
-                             if not storage.drive_status[d])
+        offline_in_dbox = storage.topology.offline_per_dbox()[selected_dbox]
         if offline_in_dbox > 0:
             st.warning(f"⚠️ {offline_in_dbox} offline")
         else:
@@ -441,9 +448,17 @@ else:
     # Create clickable drive grid
     drives_html = "<div style='display: flex; flex-wrap: wrap; justify-content: center;'>"
     
+    drive_html = st.session_state.drive_html
+    for drive_id in storage.pop_dirty_drives():
+        drive_html.pop(drive_id, None)
+    
     for idx, drive_id in enumerate(dbox['all_drives']):
-        drive_type = storage.get_drive_type(drive_id)
         online = storage.drive_status[drive_id]
+        if drive_id in drive_html and drive_html[drive_id][0] == online:
+            drives_html += drive_html[drive_id][1]
+            continue
+        
+        drive_type = storage.topology.role_name(drive_id)
         preview = storage.drive_data_preview[drive_id]
         
         # Determine CSS class
@@ -458,13 +473,15 @@ else:
         else:
             css_class = "drive-online"
         
-        drives_html += f"""
+        box_html = f"""
         <div class='drive-box {css_class}' 
              title='Drive {drive_id} - {drive_type}\nStatus: {"Online" if online else "Offline"}\nData: {preview}'>
             <div style='font-size: 11px; font-weight: bold;'>{drive_id}</div>
             <div style='font-size: 8px; margin-top: 2px;'>{preview[:4]}</div>
         </div>
         """
+        drive_html[drive_id] = (online, box_html)
+        drives_html += box_html
     
     drives_html += "</div>"
     st.markdown(drives_html, unsafe_allow_html=True)
@@ -510,8 +527,8 @@ else:
             st.markdown(f"""
             **Current Status:**
             - Mode: {'HA (18% overhead)' if storage.ha_mode else 'Normal (8.5% overhead)'}
-            - Online Drives: {sum(storage.drive_status)}
-            - Offline Drives: {sum(1 for s in storage.drive_status if not s)}
+            - Online Drives: {np.count_nonzero(storage.drive_status)}
+            - Offline Drives: {np.count_nonzero(~storage.drive_status)}
             - Files Stored: {1 if storage.stored_file_data else 0}
             """)
 
@@ -0,0 +1,41 @@
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINE = os.path.join(ROOT, 'VDATASIM-v3.1')
+# The engine imports vdatasim_topology from its own directory
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def vdatasim():
+    """The simulator engine, loaded from its extensionless script"""
+    loader = importlib.machinery.SourceFileLoader('vdatasim', ENGINE)
+    spec = importlib.util.spec_from_loader('vdatasim', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def storage(vdatasim, tmp_path):
+    """A freshly initialized array under tmp_path"""
+    storage = vdatasim.ErasureCodedStorage()
+    storage.storage_path = str(tmp_path / 'drives')
+    storage.initialize_drives()
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def stored_file(storage, tmp_path):
+    """Contents of file 'a', written to the array"""
+    data = os.urandom(300000)
+    path = tmp_path / 'a'
+    path.write_bytes(data)
+    assert storage.write_files([str(path)])[0]
+    return data
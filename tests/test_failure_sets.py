@@ -0,0 +1,8 @@
+def test_rank_deficient_sets_reported_beyond_one_global(vdatasim):
+    storage = vdatasim.ErasureCodedStorage(global_parity_count=2, max_workers=1)
+    summary = vdatasim.FailureSetFinder(storage, False).rank_deficient_sets()
+    assert len(summary) == 1 and summary[0]['domains'] == 11 and summary[0]['globals'] == 2
+    assert 0 < summary[0]['undecodable'] < summary[0]['checked']
+    
+    storage = vdatasim.ErasureCodedStorage(max_workers=1)
+    assert vdatasim.FailureSetFinder(storage, False).rank_deficient_sets() == []
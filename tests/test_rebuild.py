@@ -0,0 +1,46 @@
+def test_parity_rebuild_decodes_offline_members(storage, stored_file):
+    storage.set_drive_status(0, False)
+    storage.set_drive_status(38, False)
+    storage.rebuild_drives([38])
+    
+    assert storage.retrieve_file(name='a')[0] == stored_file
+    storage.set_drive_status(0, True)
+    assert storage.retrieve_file(name='a')[0] == stored_file
+
+
+def test_parity_rebuild_refused_when_members_cannot_be_decoded(storage, stored_file):
+    for drive_id in (0, 1, 38, 41):
+        storage.set_drive_status(drive_id, False)
+    _, info = storage.rebuild_drives([38])
+    
+    assert info[0].startswith("Drive 38: NOT rebuilt")
+    assert not storage.drive_status[38]
+
+
+def test_in_place_rebuild_is_not_read_by_parity_rebuild(storage, stored_file):
+    for spare_id in storage.dboxes[0]['spare_drives']:
+        storage.set_drive_status(spare_id, False)
+    storage.set_drive_status(0, False)
+    _, info = storage.rebuild_drives([0], bring_online=False)
+    assert "rebuilt in place and left offline" in info[-1]
+    
+    # Drive 0's in-place image goes stale while it stays offline
+    data = bytearray(stored_file)
+    data[:4096] = bytes(4096)
+    storage.write_range('a', 0, bytes(4096))
+    storage.set_drive_status(38, False)
+    storage.rebuild_drives([38], bring_online=False)
+    
+    assert storage.retrieve_file(name='a')[0] == bytes(data)
+
+
+def test_relocation_to_spares(storage, stored_file):
+    # Dbox 0 decodes drive 0; Dbox 2 cannot decode drives 88-91 and keeps its spares
+    failed = [0, 88, 89, 90, 91]
+    storage.set_drives_status(failed, False)
+    storage.rebuild_drives(failed, bring_online=False)
+    
+    assert storage.physical_drive(0) == 42 and storage.drive_status[0] and not storage.drive_status[42]
+    assert storage.physical_drive(88) == 88 and all(storage.drive_status[d] for d in (130, 131))
+    storage.set_drives_status(failed[1:], True)
+    assert storage.retrieve_file(name='a')[0] == stored_file
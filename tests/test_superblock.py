@@ -0,0 +1,14 @@
+def test_status_changes_persist_on_close_only(vdatasim, storage):
+    generation = storage.superblock_generation
+    storage.set_drive_status(5, False)
+    storage.set_drives_status(storage.dboxes[1]['all_drives'], False)
+    assert storage.superblock_generation == generation
+    
+    storage.close()
+    assert storage.superblock_generation == generation + 1
+    
+    mounted = vdatasim.ErasureCodedStorage()
+    mounted.storage_path = storage.storage_path
+    assert mounted.mount()[0]
+    assert not mounted.drive_status[5] and not mounted.drive_status[storage.dboxes[1]['all_drives']].any()
+    mounted.close()
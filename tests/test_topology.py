@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('global_parity_count', [1, 2])
+def test_lost_dboxes_matches_integrity_check(vdatasim, tmp_path, global_parity_count):
+    storage = vdatasim.ErasureCodedStorage(global_parity_count=global_parity_count)
+    storage.storage_path = str(tmp_path / 'drives')
+    storage.initialize_drives()
+    path = tmp_path / 'a'
+    path.write_bytes(bytes(300000))
+    assert storage.write_files([str(path)])[0]
+    
+    def decodable(dbox_id, offline_drives):
+        return storage.can_decode(storage.dboxes[dbox_id], offline_drives)
+    
+    rng = np.random.default_rng(global_parity_count)
+    dbox_drives = storage.dboxes[0]['all_drives']
+    for _ in range(200):
+        offline = rng.choice(dbox_drives, size=rng.integers(1, 7), replace=False).tolist()
+        storage.set_drives_status(offline, False)
+        recoverable, _, vulnerable = storage.check_data_integrity()
+        lost = storage.topology.lost_dboxes(decodable).tolist()
+        storage.set_drives_status(offline, True)
+        
+        assert lost == vulnerable and recoverable == (not lost)
+    storage.close()
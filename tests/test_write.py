@@ -0,0 +1,13 @@
+def test_write_larger_than_online_drives_is_refused(storage, stored_file, tmp_path):
+    for drive_id in range(40):
+        storage.set_drive_status(drive_id, False)
+    online = len([d for d in storage.get_all_data_drives() if storage.drive_status[d]])
+    path = tmp_path / 'big'
+    with open(path, 'wb') as f:
+        f.truncate(online * storage.drive_size)
+    layout, length = storage.data_layout, storage.stored_length
+    
+    ok, message = storage.write_files([str(path)])
+    
+    assert not ok and message.startswith("Files too large")
+    assert storage.data_layout is layout and storage.stored_length == length
@@ -0,0 +1,96 @@
+"""Drive index of the VDATASIM Dbox layout, shared by the engine, its GUI and the Streamlit app"""
+
+import numpy as np
+
+
+class DriveTopology:
+    """Per-drive index of the Dbox layout as NumPy arrays, built once
+    
+    role, dbox, group (local group within the Dbox, -1 for drives outside
+    any group) and position (index within the local group for data drives,
+    among the Dbox's drives of the same role otherwise) make single-drive
+    lookups O(1). status is the online mask; an engine's drive_status is
+    this array, so group-wide failure counts are vectorized bincounts.
+    dboxes are the engine's Dbox dicts (id, all_drives, data_drives,
+    local_parity_drives, global_parity_drives, spare_drives, local_groups).
+    """
+    
+    ROLES = ("Data", "Local Parity", "Global Parity", "Hot Spare")
+    DATA, LOCAL_PARITY, GLOBAL_PARITY, SPARE = range(4)
+    
+    def __init__(self, dboxes, total_drives):
+        self.num_dboxes = len(dboxes)
+        self.groups_per_dbox = max(len(dbox['local_groups']) for dbox in dboxes)
+        self.role = np.full(total_drives, -1, dtype=np.int8)
+        self.dbox = np.full(total_drives, -1, dtype=np.int16)
+        self.group = np.full(total_drives, -1, dtype=np.int8)
+        self.position = np.full(total_drives, -1, dtype=np.int16)
+        self.status = np.ones(total_drives, dtype=bool)
+        self.group_parity = np.zeros((self.num_dboxes, self.groups_per_dbox), dtype=bool)
+        
+        for dbox in dboxes:
+            self.dbox[dbox['all_drives']] = dbox['id']
+            for role, drives in ((self.DATA, dbox['data_drives']),
+                                 (self.LOCAL_PARITY, dbox['local_parity_drives']),
+                                 (self.GLOBAL_PARITY, dbox['global_parity_drives']),
+                                 (self.SPARE, dbox['spare_drives'])):
+                self.role[drives] = role
+                self.position[drives] = np.arange(len(drives))
+            for index, group in enumerate(dbox['local_groups']):
+                self.group[group['data_drives']] = index
+                self.position[group['data_drives']] = np.arange(len(group['data_drives']))
+                if group['parity_drive'] is not None:
+                    self.group[group['parity_drive']] = index
+                    self.group_parity[dbox['id'], index] = True
+    
+    def role_name(self, drive_id):
+        """Role of a drive as shown to users"""
+        role = self.role[drive_id]
+        return self.ROLES[role] if role >= 0 else "Unknown"
+    
+    def drives(self, role=None, dbox=None, online=None):
+        """IDs of the drives matching a role, Dbox and online state (None matches all)"""
+        mask = np.ones(len(self.role), dtype=bool)
+        if role is not None:
+            mask &= self.role == role
+        if dbox is not None:
+            mask &= self.dbox == dbox
+        if online is not None:
+            mask &= self.status == online
+        return np.flatnonzero(mask)
+    
+    def offline_per_dbox(self):
+        """Offline drives in each Dbox"""
+        return np.bincount(self.dbox[~self.status], minlength=self.num_dboxes)
+    
+    def offline_per_group(self, role=DATA):
+        """Offline drives of a role in each local group, as a (Dboxes, groups) array"""
+        mask = ~self.status & (self.role == role) & (self.group >= 0)
+        flat = self.dbox[mask].astype(np.intp) * self.groups_per_dbox + self.group[mask]
+        counts = np.bincount(flat, minlength=self.num_dboxes * self.groups_per_dbox)
+        return counts.reshape(self.num_dboxes, self.groups_per_dbox)
+    
+    def excess_per_dbox(self):
+        """Offline data drives of each Dbox beyond the one each group's online local parity covers"""
+        covered = self.group_parity & (self.offline_per_group(self.LOCAL_PARITY) == 0)
+        return np.maximum(self.offline_per_group() - covered, 0).sum(axis=1)
+    
+    def lost_dboxes(self, decodable=None):
+        """IDs of the Dboxes whose offline data drives their online parity cannot decode
+        
+        The engine's IntegrityTracker rule: each local group with an online
+        parity drive absorbs one failed data drive, and the excess must fit
+        the Dbox's online global parities. Reed-Solomon rows beyond the
+        first are not maximally recoverable, so with 2 or more excess
+        failures decodable(dbox_id, offline_drives) confirms the set by
+        equation rank (the engine's can_decode); without it the count decides,
+        which is exact for one global parity.
+        """
+        excess = self.excess_per_dbox()
+        globals_online = np.bincount(self.dbox[self.status & (self.role == self.GLOBAL_PARITY)],
+                                     minlength=self.num_dboxes)
+        lost = excess > globals_online
+        if decodable is not None:
+            for dbox_id in np.flatnonzero((excess >= 2) & ~lost):
+                lost[dbox_id] = not decodable(int(dbox_id), self.drives(dbox=dbox_id, online=False).tolist())
+        return np.flatnonzero(lost)